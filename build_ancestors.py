@@ -0,0 +1,37 @@
+"""Offline builder for the WordNet ancestor lookup table.
+
+Run once (``python build_ancestors.py``) to dump ``ancestors.pkl`` next to
+``app.py``. When the file is present the app loads it at startup and skips
+the per-word hypernym walks entirely, turning the runtime BFS into a dict
+lookup.
+"""
+import pickle
+from pathlib import Path
+
+from nltk.corpus import wordnet
+
+
+def build_table():
+    """Map every synset name to a {ancestor_name: min_upward_distance} dict"""
+    table = {}
+    for synset in wordnet.all_synsets():
+        ancestors = {}
+        stack = [(synset, 0)]
+        while stack:
+            current, depth = stack.pop()
+            name = current.name()
+            if name in ancestors and ancestors[name] <= depth:
+                continue
+            ancestors[name] = depth
+            stack.extend((hypernym, depth + 1)
+                         for hypernym in current.hypernyms() + current.instance_hypernyms())
+        table[synset.name()] = ancestors
+    return table
+
+
+if __name__ == '__main__':
+    output_path = Path(__file__).with_name('ancestors.pkl')
+    table = build_table()
+    with open(output_path, 'wb') as f:
+        pickle.dump(table, f, protocol=5)
+    print(f"Wrote {len(table)} synsets to {output_path}")
@@ -0,0 +1,376 @@
+"""Core game logic shared by the Streamlit UI: noun fetching, similarity
+scoring and hint generation, with all heavy WordNet state cached at module
+level so one warm process serves every session."""
+import streamlit as st
+import collections
+import concurrent.futures
+import pickle
+import random
+import re
+import requests
+import nltk
+from pathlib import Path
+from requests.adapters import HTTPAdapter, Retry
+from nltk.corpus import wordnet
+from nltk.corpus import brown
+import numpy as np
+from collections import Counter
+from rapidfuzz import fuzz
+from functools import cache, lru_cache
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+# Download required NLTK data and prime WordNet, at most once per process
+@st.cache_resource(show_spinner=False)
+def _init_wordnet():
+    try:
+        nltk.data.find('corpora/wordnet')
+        nltk.data.find('corpora/brown')
+    except LookupError:
+        nltk.download('wordnet', quiet=True)
+        nltk.download('brown', quiet=True)
+    wordnet.ensure_loaded()
+    return wordnet
+
+_init_wordnet()
+
+# Brown-corpus frequency structures, deferred to first use so importing the
+# module (e.g. on a dev-mode reload) doesn't pay for the corpus at all
+@st.cache_resource(show_spinner=False)
+def _load_word_freq():
+    """Brown-corpus word frequencies, pickled to disk after the first build so
+    later process starts skip iterating the ~1M-token corpus"""
+    cache_path = Path.home() / '.cache' / 'word_guess' / 'brown_freq.pkl'
+    if cache_path.exists():
+        return pickle.loads(cache_path.read_bytes())
+    counts = Counter(word.lower() for word in brown.words())
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(pickle.dumps(counts, protocol=5))
+    return counts
+
+@cache
+def _freq_factor_map():
+    """Pre-clipped frequency factors - get_word_complexity only ever needs
+    min(1, freq/1000), so store that and skip the divide per lookup"""
+    return {w: min(1.0, c / 1000.0) for w, c in _load_word_freq().items()}
+
+@cache
+def _stopwords():
+    """Definition-hint filter: common function words plus the Brown corpus's
+    top-30 tokens"""
+    return frozenset({'the', 'and', 'or', 'a', 'an', 'in', 'of', 'to', 'for',
+                      'is', 'it', 'that', 'this', 'with', 'as', 'by', 'on',
+                      'at', 'be', 'are', 'was', 'were'}) \
+        | frozenset(w for w, _ in _load_word_freq().most_common(30))
+
+@lru_cache(maxsize=8192)
+def _cached_synsets(word):
+    """Memoized wordnet.synsets lookup - avoids repeated lexicon hits per guess"""
+    return wordnet.synsets(word)
+
+# Memoized synset relation accessors - the same synsets recur as hypernyms of
+# many words during a session, and NLTK recomputes these on every call
+@cache
+def _hypernyms(synset):
+    return tuple(synset.hypernyms() + synset.instance_hypernyms())
+
+@cache
+def _lemmas(synset):
+    return tuple(synset.lemmas())
+
+@cache
+def _hypernym_paths(synset):
+    return tuple(tuple(path) for path in synset.hypernym_paths())
+
+@cache
+def _definition_tokens(synset):
+    return tuple(synset.definition().split())
+
+@cache
+def _examples(synset):
+    return tuple(synset.examples())
+
+def _ancestors_with_depth(synset):
+    """Map each hypernym ancestor name of a synset (itself included) to its
+    minimum upward distance"""
+    ancestors = {}
+    stack = [(synset, 0)]
+    while stack:
+        current, depth = stack.pop()
+        name = current.name()
+        if name in ancestors and ancestors[name] <= depth:
+            continue
+        ancestors[name] = depth
+        stack.extend((hypernym, depth + 1) for hypernym in _hypernyms(current))
+    return ancestors
+
+_ANCESTOR_TABLE_PATH = Path(__file__).with_name('ancestors.pkl')
+
+@st.cache_resource(show_spinner=False)
+def _load_ancestor_table():
+    """Load the table dumped by build_ancestors.py, if it has been built"""
+    if _ANCESTOR_TABLE_PATH.exists():
+        with open(_ANCESTOR_TABLE_PATH, 'rb') as f:
+            return pickle.load(f)
+    return None
+
+@lru_cache(maxsize=4096)
+def _ancestor_maps(word):
+    """Ancestor index for every synset of a word - a dict lookup when the
+    precomputed table exists, otherwise one hypernym walk per word"""
+    table = _load_ancestor_table()
+    if table is not None:
+        return tuple(table[synset.name()] for synset in _cached_synsets(word))
+    return tuple(_ancestors_with_depth(synset) for synset in _cached_synsets(word))
+
+@cache
+def _synset_index():
+    """Integer id for every WordNet synset name, assigned once on first use"""
+    return {synset.name(): i for i, synset in enumerate(wordnet.all_synsets())}
+
+@lru_cache(maxsize=4096)
+def _word_ancestor_arrays(word):
+    """Merged (ids, depths) int32 arrays over all of a word's synsets, keeping
+    the minimum depth per ancestor and sorted by id.
+
+    Because synset choices on the two sides are independent, the minimum
+    distance over every guess x target synset pair equals the minimum over
+    shared ancestors of the merged depths - so one join per guess replaces
+    the whole pairwise grid.
+    """
+    index = _synset_index()
+    merged = {}
+    for ancestors in _ancestor_maps(word):
+        for name, depth in ancestors.items():
+            synset_id = index[name]
+            if synset_id not in merged or depth < merged[synset_id]:
+                merged[synset_id] = depth
+    ids = np.fromiter(merged.keys(), dtype=np.int32, count=len(merged))
+    depths = np.fromiter(merged.values(), dtype=np.int32, count=len(merged))
+    order = np.argsort(ids)
+    return ids[order], depths[order]
+
+def get_word_complexity(word):
+    """Calculate word complexity based on frequency and length"""
+    freq_factor = _freq_factor_map().get(word.lower(), 0.0)
+    length_factor = len(word) / 10  # normalize length
+    return 1 - ((freq_factor + (1 - length_factor)) / 2)  # 0 = simple, 1 = complex
+
+# ASCII-only match beats per-codepoint isalpha() on the 1000-entry response
+_ALPHA = re.compile(r'[A-Za-z]+\Z').match
+
+# Keep-alive session so refetches skip the TCP+TLS handshake
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=2, pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.3)))
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_noun_pool():
+    """Fetch a large batch of candidate nouns from the Datamuse API.
+
+    Cached for an hour so only the first game pays the network round trip;
+    every later "New Game" picks locally from the pool.
+    """
+    response = _session.get("https://api.datamuse.com/words?rel_jja=noun&max=1000", timeout=5)
+    response.raise_for_status()
+    # Validate WordNet coverage here, once per fetch, so chosen targets are
+    # guaranteed to have synsets for scoring and hints
+    return [word['word'] for word in response.json()
+            if _ALPHA(word['word']) and _cached_synsets(word['word'])]
+
+# Shuffled queue of upcoming targets; popping instead of random.choice avoids
+# repeating a target until the whole pool has been played through
+_noun_queue = collections.deque()
+
+def _pop_noun():
+    if not _noun_queue:
+        try:
+            pool = list(_fetch_noun_pool())
+        except requests.RequestException:
+            return None
+        random.shuffle(pool)
+        _noun_queue.extend(pool)
+    return _noun_queue.popleft() if _noun_queue else None
+
+def fetch_random_noun():
+    """Pop the next noun from the shuffled queue of validated candidates"""
+    noun = _pop_noun()
+    if noun:
+        return noun
+    st.error("Failed to fetch noun or no suitable nouns available")
+    return None
+
+# Background workers that warm the next game's noun and the current game's
+# hints off the critical path
+_prefetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+def _next_noun():
+    """Quiet variant of fetch_random_noun for the background prefetch -
+    never touches Streamlit UI from the worker thread"""
+    return _pop_noun()
+
+def prefetch_next_noun():
+    """Schedule a background pick of the next game's noun; returns a Future"""
+    return _prefetch_pool.submit(_next_noun)
+
+def prefetch_hints(word):
+    """Generate hints for a freshly chosen target in the background"""
+    return _prefetch_pool.submit(get_enhanced_semantic_hints, word)
+
+
+@st.cache_data(max_entries=10000, show_spinner=False)
+def calculate_enhanced_similarity(guess, target):
+    """
+    Calculate semantic similarity between guess and target word
+    Returns a score from 0 (identical) to 1000 (completely different)
+    """
+    return _similarity_cached(guess.strip().lower(), target.strip().lower())
+
+# Sentinel distance returned when the two words share no ancestor
+_NO_MATCH = 1 << 30
+
+def _min_joined_numpy(guess_ids, guess_depths, target_ids, target_depths):
+    """Min of summed depths over shared ids via np.intersect1d"""
+    _, guess_idx, target_idx = np.intersect1d(
+        guess_ids, target_ids, assume_unique=True, return_indices=True)
+    if not guess_idx.size:
+        return _NO_MATCH
+    return int((guess_depths[guess_idx] + target_depths[target_idx]).min())
+
+if njit is not None:
+    @njit(cache=True)
+    def _min_joined(guess_ids, guess_depths, target_ids, target_depths):
+        # Sorted merge over the id arrays - no intermediate allocations
+        best = _NO_MATCH
+        i = 0
+        j = 0
+        while i < len(guess_ids) and j < len(target_ids):
+            a = guess_ids[i]
+            b = target_ids[j]
+            if a == b:
+                total = guess_depths[i] + target_depths[j]
+                if total < best:
+                    best = total
+                i += 1
+                j += 1
+            elif a < b:
+                i += 1
+            else:
+                j += 1
+        return best
+else:
+    _min_joined = _min_joined_numpy
+
+@lru_cache(maxsize=8192)
+def _similarity_cached(guess, target):
+    """Memoized similarity on lowercased (guess, target) pairs"""
+    if guess == target:
+        return 0
+
+    guess_synsets = _cached_synsets(guess)
+    target_synsets = _cached_synsets(target)
+    if guess_synsets and not set(guess_synsets).isdisjoint(target_synsets):
+        return 0  # true synonyms share a synset
+
+    guess_ids, guess_depths = _word_ancestor_arrays(guess)
+    target_ids, target_depths = _word_ancestor_arrays(target)
+    best_distance = _min_joined(guess_ids, guess_depths, target_ids, target_depths)
+
+    if best_distance == _NO_MATCH:
+        # No WordNet coverage - fall back to C-implemented string similarity
+        return 1000 - int(fuzz.ratio(guess, target) * 10)
+
+    return int((1 - 1 / (best_distance + 1)) * 1000)
+
+@lru_cache(maxsize=1024)
+def _mask_pattern(word):
+    """Compiled word-boundary pattern for masking the target in examples"""
+    return re.compile(rf"\b{re.escape(word)}\b", re.IGNORECASE)
+
+def warm_target(word):
+    """Precompute the fixed target's cached features when a game starts.
+
+    The per-word caches would fill on the first guess anyway; warming them
+    here moves the target's hypernym walk and array build off the first
+    guess's latency.
+    """
+    if word:
+        _word_ancestor_arrays(word.strip().lower())
+
+def get_enhanced_semantic_hints(word, num_hints=10):
+    """Generate up to num_hints semantic hints for the target word"""
+    synsets = _cached_synsets(word)
+
+    if not synsets:
+        return []
+
+    primary_synset = synsets[0]
+
+    # 1. Synonyms with complexity rating
+    def synonym_hints():
+        for lemma in _lemmas(primary_synset):
+            synonym = lemma.name()
+            if synonym != word and len(synonym) > 2:
+                if get_word_complexity(synonym) < 0.7:  # Only use relatively common synonyms
+                    yield ("synonym", f"Similar word: {synonym}")
+
+    # 2. Hypernyms (categories)
+    def category_hints():
+        for path in _hypernym_paths(primary_synset):
+            for hypernym in path[-3:]:  # Get last 3 levels of hierarchy
+                for lemma in _lemmas(hypernym):
+                    name = lemma.name()
+                    if name != word and len(name) > 2:
+                        yield ("category", f"Type of: {name}")
+
+    # 3. Definitional hints
+    def definition_hints():
+        def_words = _definition_tokens(primary_synset)
+        if len(def_words) > 3:
+            key_words = list(dict.fromkeys(
+                w for w in def_words if len(w) > 3 and w.lower() not in _stopwords()))
+            if key_words:
+                # Sampling only kicks in when there is actually a choice to make
+                if len(key_words) <= 3:
+                    hint_phrase = " ".join(key_words)
+                else:
+                    hint_phrase = " ".join(random.sample(key_words, 3))
+                yield ("definition", f"Definition contains: {hint_phrase}")
+
+    # 4. Usage example hints
+    def usage_hints():
+        examples = _examples(primary_synset)
+        if examples:
+            example = random.choice(examples)
+            masked_example = _mask_pattern(word).sub("___", example)
+            yield ("usage", f"Used in: {masked_example}")
+
+    # 5. Domain categories
+    def domain_hints():
+        for domain in primary_synset.topic_domains():
+            yield ("domain", f"Related to: {domain.name().split('.')[0]}")
+
+    # Round-robin the hint sources in a random order, deduplicating as hints
+    # are emitted; interleaving by construction means no post-pass dedupe or
+    # second shuffle is needed
+    sources = [synonym_hints(), category_hints(), definition_hints(),
+               usage_hints(), domain_hints()]
+    random.shuffle(sources)
+
+    seen = set()
+    hints = []
+    while sources and len(hints) < num_hints:
+        for source in sources[:]:
+            hint = next(source, None)
+            if hint is None:
+                sources.remove(source)
+            elif hint[1] not in seen:
+                seen.add(hint[1])
+                hints.append(hint)
+                if len(hints) >= num_hints:
+                    break
+    return hints
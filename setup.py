@@ -20,5 +20,5 @@ setup(
     author= 'Anduri Roshan',
     author_email='roshanandhuri@gmail.com',
     packages= find_packages(),
-    install_required = get_requirements('requirements.txt')
+    install_requires = get_requirements('requirements.txt')
 )
\ No newline at end of file